@@ -1,196 +1,551 @@
+import atexit
+import hashlib
 import os
+import queue
 import sqlite3
-from typing import Dict, List, Optional
-from datetime import datetime, timedelta
-import json
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple, Union
+import msgpack
+from .exceptions import CacheError
+
+# Bump whenever the table layout changes; older cache databases are rebuilt
+SCHEMA_VERSION = 10
+
+# Per-connection tuning applied to every connection we open
+_CONNECTION_PRAGMAS = (
+    'PRAGMA busy_timeout=5000',
+    'PRAGMA cache_size=-20000',  # ~20MB page cache
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA mmap_size=268435456',  # 256MB
+)
+
+_TABLES = ('conflicts', 'compatible_versions', 'resolutions', 'http_responses', 'requires', 'compatible_for')
+
+def _key(*parts) -> bytes:
+    """Fixed-size lookup key for a tuple of msgpack-serializable parts
+
+    The first part names the table, since all tables share one in-memory memo.
+    """
+    return hashlib.blake2b(msgpack.packb(parts, use_bin_type=True), digest_size=16).digest()
+
+def _conflict_key(package: str, conflict: Dict[str, List[str]]) -> bytes:
+    """Lookup key for a package's conflict, independent of key and specifier order"""
+    return _key('compatible_versions', package, sorted((source, sorted(specs) if isinstance(specs, list) else specs)
+                                                       for source, specs in conflict.items()))
 
 class DependencyCache:
     """Cache for dependency resolution results using SQLite"""
-    
+
     def __init__(self, cache_dir: str = '.depsimplify'):
         self.cache_dir = cache_dir
         self.db_file = os.path.join(cache_dir, 'cache.db')
-        self.cache_expiry = timedelta(days=1)  # Cache expires after 1 day
+        self.cache_expiry = 24 * 60 * 60  # Cache expires after 1 day, in seconds
+        # One writer connection shared behind a lock, one read-only connection per thread
+        self._write_conn: Optional[sqlite3.Connection] = None
+        self._write_lock = threading.Lock()
+        # Serializes opening and migrating the database, which any thread may trigger
+        self._init_lock = threading.Lock()
+        self._readers = threading.local()
+        self._read_conns: List[sqlite3.Connection] = []
+        # Entries already read or written by this process, keyed like the tables
+        self._memo: Dict[bytes, Tuple[int, Any]] = {}
+        # Writes are applied by a background thread so callers never wait on disk;
+        # None tells it to stop
+        self._write_q: "queue.Queue[Optional[Tuple[str, List[tuple]]]]" = queue.Queue()
+        self._write_thread: Optional[threading.Thread] = None
 
     def initialize(self) -> None:
         """Initialize SQLite database and create required tables"""
-        os.makedirs(self.cache_dir, exist_ok=True)
-        
-        try:
-            with sqlite3.connect(self.db_file) as conn:
-                cursor = conn.cursor()
-                
-                # Create tables for different types of cache data
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS conflicts (
-                        dependencies_key TEXT PRIMARY KEY,
-                        conflicts_data TEXT NOT NULL,
-                        last_updated TIMESTAMP NOT NULL
-                    )
-                ''')
-                
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS compatible_versions (
-                        conflict_key TEXT PRIMARY KEY,
-                        versions TEXT NOT NULL,
-                        last_updated TIMESTAMP NOT NULL
-                    )
-                ''')
-                
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS resolutions (
-                        package TEXT PRIMARY KEY,
-                        version TEXT NOT NULL,
-                        last_updated TIMESTAMP NOT NULL
-                    )
-                ''')
-                
-                # Create indices for better performance
-                cursor.execute('CREATE INDEX IF NOT EXISTS idx_conflicts_last_updated ON conflicts(last_updated)')
-                cursor.execute('CREATE INDEX IF NOT EXISTS idx_compatible_versions_last_updated ON compatible_versions(last_updated)')
-                cursor.execute('CREATE INDEX IF NOT EXISTS idx_resolutions_last_updated ON resolutions(last_updated)')
-                
-                conn.commit()
-        except sqlite3.Error as e:
-            os.makedirs(self.cache_dir, exist_ok=True)  # Ensure directory exists
-            if os.path.exists(self.db_file):
-                os.remove(self.db_file)  # Remove corrupted database
-            raise Exception(f"Failed to initialize cache database: {str(e)}")
-
-    def _is_cache_valid(self, last_updated: str) -> bool:
-        """Check if cache entry is still valid"""
-        if not last_updated:
-            return False
+        with self._init_lock:
+            self._initialize()
+
+    def _initialize(self) -> None:
+        """Open and migrate the database; the caller holds _init_lock"""
+        conn = self._write_conn
         try:
-            updated_time = datetime.fromisoformat(last_updated)
-            return datetime.now() - updated_time <= self.cache_expiry
-        except (ValueError, TypeError):
-            return False
+            os.makedirs(self.cache_dir, exist_ok=True)
+            if conn is None:
+                conn = sqlite3.connect(self.db_file, check_same_thread=False, isolation_level=None)
+
+            # WAL lets readers proceed during writes; NORMAL only fsyncs at checkpoints
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            for pragma in _CONNECTION_PRAGMAS:
+                conn.execute(pragma)
+
+            # Cached data is disposable, so an outdated layout is simply dropped
+            if conn.execute('PRAGMA user_version').fetchone()[0] != SCHEMA_VERSION:
+                for table in _TABLES:
+                    conn.execute(f'DROP TABLE IF EXISTS {table}')
+                conn.execute(f'PRAGMA user_version={SCHEMA_VERSION}')
+
+            # Create tables for different types of cache data
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS conflicts (
+                    dependencies_key BLOB PRIMARY KEY,
+                    conflicts_data BLOB NOT NULL,
+                    last_updated INTEGER NOT NULL
+                ) WITHOUT ROWID
+            ''')
+
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS compatible_versions (
+                    conflict_key BLOB PRIMARY KEY,
+                    versions BLOB NOT NULL,
+                    last_updated INTEGER NOT NULL
+                ) WITHOUT ROWID
+            ''')
+
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS resolutions (
+                    package TEXT PRIMARY KEY,
+                    version TEXT NOT NULL,
+                    last_updated INTEGER NOT NULL
+                ) WITHOUT ROWID
+            ''')
+
+            # Served as-is while younger than the caller's TTL and revalidated with
+            # conditional requests after that, so rows have no expiry of their own.
+            # A 404 is kept too, with an empty body, so unknown packages fail fast
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS http_responses (
+                    url TEXT PRIMARY KEY,
+                    status INTEGER NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    body BLOB NOT NULL,
+                    last_updated INTEGER NOT NULL
+                ) WITHOUT ROWID
+            ''')
+
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS compatible_for (
+                    requirement_key BLOB PRIMARY KEY,
+                    result BLOB NOT NULL,
+                    last_updated INTEGER NOT NULL
+                ) WITHOUT ROWID
+            ''')
+
+            # A published release's requirements never change, so rows have no expiry
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS requires (
+                    release_key BLOB PRIMARY KEY,
+                    requires BLOB NOT NULL,
+                    last_updated INTEGER NOT NULL
+                ) WITHOUT ROWID
+            ''')
+
+            # Key lookups are served by the clustered primary keys; only the
+            # resolutions scan filters on last_updated alone
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_resolutions_last_updated ON resolutions(last_updated)')
+
+            # Only publish the connection once the tables are in place
+            self._write_conn = conn
+
+        except (sqlite3.Error, OSError) as e:
+            # Only the connection being initialized is closed: other threads may be using
+            # their readers, and this can run on the writer thread, which must never wait
+            # on its own queue
+            if conn is not None:
+                conn.close()
+            if self._write_conn is conn:
+                self._write_conn = None
+            # Remove the corrupted database along with its WAL side files, which
+            # SQLite would otherwise replay into the fresh one
+            for path in (self.db_file, self.db_file + '-wal', self.db_file + '-shm'):
+                try:
+                    if os.path.isfile(path):
+                        os.remove(path)
+                except OSError:
+                    pass
+            # Callers treat this as a miss and carry on without the cache
+            raise CacheError(f"Failed to initialize cache database: {str(e)}")
+
+    def close(self) -> None:
+        """Flush pending writes, stop the writer thread and close all connections"""
+        self.flush()
+        self._stop_writer()
+        self._close_connections()
+
+    def _stop_writer(self) -> None:
+        """Stop the background writer; a later write starts a new one"""
+        with self._write_lock:
+            thread, self._write_thread = self._write_thread, None
+        if thread is None:
+            return
+        atexit.unregister(self.flush)
+        self._write_q.put(None)
+        if thread is not threading.current_thread():
+            thread.join()
+
+    def _close_connections(self) -> None:
+        """Close the writer and all reader connections without waiting on queued writes"""
+        with self._write_lock:
+            if self._write_conn is not None:
+                self._write_conn.close()
+                self._write_conn = None
+            for conn in self._read_conns:
+                conn.close()
+            self._read_conns = []
+            self._readers = threading.local()
 
-    def get_conflicts(self, dependencies: Dict[str, List[str]]) -> Optional[Dict]:
-        """Get cached conflicts for dependencies"""
+    def _writer(self) -> sqlite3.Connection:
+        """Get the shared writer connection, initializing the database on first use"""
+        conn = self._write_conn
+        if conn is None:
+            with self._init_lock:
+                # Another thread may have finished initializing while this one waited
+                if self._write_conn is None:
+                    self._initialize()
+                conn = self._write_conn
+        return conn
+
+    def _reader(self) -> sqlite3.Connection:
+        """Get this thread's read-only connection, opening it on first use"""
+        conn = getattr(self._readers, 'conn', None)
+        if conn is None:
+            self._writer()  # Make sure the database file and tables exist
+            conn = sqlite3.connect(f"file:{self.db_file}?mode=ro", uri=True, check_same_thread=False)
+            for pragma in _CONNECTION_PRAGMAS:
+                conn.execute(pragma)
+            self._readers.conn = conn
+            with self._write_lock:
+                self._read_conns.append(conn)
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        """Run a write transaction on the writer connection"""
+        conn = self._writer()
+        with self._write_lock:
+            # Take the write lock up front so the transaction never has to upgrade
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield conn
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+            conn.execute('COMMIT')
+
+    def _enqueue_write(self, sql: str, rows: List[tuple]) -> None:
+        """Queue rows for the background writer, starting it on first use"""
+        if self._write_thread is None:
+            with self._write_lock:
+                if self._write_thread is None:
+                    self._write_thread = threading.Thread(target=self._drain_writes, daemon=True)
+                    self._write_thread.start()
+                    atexit.register(self.flush)
+        self._write_q.put((sql, rows))
+
+    def _drain_writes(self) -> None:
+        """Apply queued writes, batching everything pending into one transaction"""
+        while True:
+            batch = [self._write_q.get()]
+            while True:
+                try:
+                    batch.append(self._write_q.get_nowait())
+                except queue.Empty:
+                    break
+            writes = [item for item in batch if item is not None]
+            try:
+                if writes:
+                    with self._transaction() as conn:
+                        for sql, rows in writes:
+                            conn.executemany(sql, rows)
+            except Exception:
+                pass  # A lost cache write only costs a later cache miss; the thread must live on
+            finally:
+                for _ in batch:
+                    self._write_q.task_done()
+            if len(writes) < len(batch):
+                return
+
+    def flush(self) -> None:
+        """Block until every queued write has been applied"""
+        thread = self._write_thread
+        # The writer cannot wait for itself, and a dead one would never finish the queue
+        if thread is None or thread is threading.current_thread() or not thread.is_alive():
+            return
+        self._write_q.join()
+
+    def _expiry_cutoff(self) -> int:
+        """Oldest epoch timestamp that is still considered fresh"""
+        return int(time.time()) - self.cache_expiry
+
+    @staticmethod
+    def _hash_deps(dependencies: Dict[str, List[str]]) -> bytes:
+        """Digest of a dependency map, used as its conflicts cache key"""
+        # Neither package order nor the order of a package's specifiers changes the result.
+        # Nameless entries are ignored by find_conflicts; other non-list values are kept as-is
+        return _key('conflicts', sorted((pkg, sorted(specs) if isinstance(specs, list) else specs)
+                                        for pkg, specs in dependencies.items() if pkg))
+
+    def _memo_get(self, key: bytes) -> Optional[Any]:
+        """Get a value this process has already seen, if it is still fresh"""
+        entry = self._memo.get(key)
+        if entry and entry[0] > self._expiry_cutoff():
+            return entry[1]
+        return None
+
+    def get_conflicts(self, dependencies: Union[Dict[str, List[str]], bytes]) -> Optional[Dict]:
+        """Get cached conflicts for dependencies or a precomputed _hash_deps digest"""
         if not dependencies:
             return None
-            
-        deps_key = json.dumps(dependencies, sort_keys=True)
-        
+
+        deps_key = dependencies if isinstance(dependencies, bytes) else self._hash_deps(dependencies)
+        memoized = self._memo_get(deps_key)
+        if memoized is not None:
+            return memoized
+
         try:
-            with sqlite3.connect(self.db_file) as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    'SELECT conflicts_data, last_updated FROM conflicts WHERE dependencies_key = ?',
-                    (deps_key,)
-                )
-                row = cursor.fetchone()
-                
-                if row and self._is_cache_valid(row[1]):
-                    return json.loads(row[0])
-                return None
-                
-        except (sqlite3.Error, json.JSONDecodeError):
-            return None
-
-    def store_conflicts(self, dependencies: Dict[str, List[str]], conflicts: Dict) -> None:
-        """Store conflicts in SQLite cache"""
+            row = self._reader().execute(
+                'SELECT conflicts_data, last_updated FROM conflicts WHERE dependencies_key = ? AND last_updated > ?',
+                (deps_key, self._expiry_cutoff())
+            ).fetchone()
+
+            if row:
+                conflicts = msgpack.unpackb(row[0], raw=False)
+                self._memo[deps_key] = (row[1], conflicts)
+                return conflicts
+            return None
+
+        except (sqlite3.Error, CacheError, ValueError):
+            return None
+
+    def store_conflicts(self, dependencies: Union[Dict[str, List[str]], bytes], conflicts: Dict) -> None:
+        """Store conflicts for dependencies or a precomputed _hash_deps digest in SQLite cache"""
         if not dependencies or not conflicts:
             return
-            
-        deps_key = json.dumps(dependencies, sort_keys=True)
-        conflicts_data = json.dumps(conflicts)
-        last_updated = datetime.now().isoformat()
-        
-        try:
-            with sqlite3.connect(self.db_file) as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    '''INSERT OR REPLACE INTO conflicts 
-                       (dependencies_key, conflicts_data, last_updated) 
-                       VALUES (?, ?, ?)''',
-                    (deps_key, conflicts_data, last_updated)
-                )
-                conn.commit()
-        except sqlite3.Error:
-            pass
+
+        deps_key = dependencies if isinstance(dependencies, bytes) else self._hash_deps(dependencies)
+        conflicts_data = msgpack.packb(conflicts, use_bin_type=True)
+        last_updated = int(time.time())
+        self._memo[deps_key] = (last_updated, conflicts)
+
+        self._enqueue_write(
+            '''INSERT INTO conflicts
+               (dependencies_key, conflicts_data, last_updated)
+               VALUES (?, ?, ?)
+               ON CONFLICT(dependencies_key) DO UPDATE SET
+                   conflicts_data = excluded.conflicts_data,
+                   last_updated = excluded.last_updated''',
+            [(deps_key, conflicts_data, last_updated)]
+        )
 
     def get_compatible_versions(self, package: str, conflict: Dict[str, List[str]]) -> Optional[List[str]]:
         """Get cached compatible versions"""
         if not package or not conflict:
             return None
-            
-        conflict_key = json.dumps({'package': package, 'conflict': conflict}, sort_keys=True)
-        
+
+        conflict_key = _conflict_key(package, conflict)
+        memoized = self._memo_get(conflict_key)
+        if memoized is not None:
+            return memoized
+
         try:
-            with sqlite3.connect(self.db_file) as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    'SELECT versions, last_updated FROM compatible_versions WHERE conflict_key = ?',
-                    (conflict_key,)
-                )
-                row = cursor.fetchone()
-                
-                if row and self._is_cache_valid(row[1]):
-                    return json.loads(row[0])
-                return None
-                
-        except (sqlite3.Error, json.JSONDecodeError):
+            row = self._reader().execute(
+                'SELECT versions, last_updated FROM compatible_versions WHERE conflict_key = ? AND last_updated > ?',
+                (conflict_key, self._expiry_cutoff())
+            ).fetchone()
+
+            if row:
+                versions = msgpack.unpackb(row[0], raw=False)
+                self._memo[conflict_key] = (row[1], versions)
+                return versions
+            return None
+
+        except (sqlite3.Error, CacheError, ValueError):
             return None
 
     def store_compatible_versions(self, package: str, conflict: Dict[str, List[str]], versions: List[str]) -> None:
         """Store compatible versions in SQLite cache"""
         if not package or not conflict or not versions:
             return
-            
-        conflict_key = json.dumps({'package': package, 'conflict': conflict}, sort_keys=True)
-        versions_data = json.dumps(versions)
-        last_updated = datetime.now().isoformat()
-        
+
+        conflict_key = _conflict_key(package, conflict)
+        versions_data = msgpack.packb(versions, use_bin_type=True)
+        last_updated = int(time.time())
+        self._memo[conflict_key] = (last_updated, versions)
+
+        self._enqueue_write(
+            '''INSERT INTO compatible_versions
+               (conflict_key, versions, last_updated)
+               VALUES (?, ?, ?)
+               ON CONFLICT(conflict_key) DO UPDATE SET
+                   versions = excluded.versions,
+                   last_updated = excluded.last_updated''',
+            [(conflict_key, versions_data, last_updated)]
+        )
+
+    def get_compatible_for(self, package: str, specs: List[str]) -> Optional[Dict]:
+        """Get the cached outcome of checking one direct requirement against its releases"""
+        if not package or not specs:
+            return None
+
+        requirement_key = _key('compatible_for', package, sorted(specs))
+        memoized = self._memo_get(requirement_key)
+        if memoized is not None:
+            return memoized
+
         try:
-            with sqlite3.connect(self.db_file) as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    '''INSERT OR REPLACE INTO compatible_versions 
-                       (conflict_key, versions, last_updated) 
-                       VALUES (?, ?, ?)''',
-                    (conflict_key, versions_data, last_updated)
-                )
-                conn.commit()
-        except sqlite3.Error:
-            pass
+            row = self._reader().execute(
+                'SELECT result, last_updated FROM compatible_for WHERE requirement_key = ? AND last_updated > ?',
+                (requirement_key, self._expiry_cutoff())
+            ).fetchone()
+
+            if row:
+                result = msgpack.unpackb(row[0], raw=False)
+                self._memo[requirement_key] = (row[1], result)
+                return result
+            return None
+
+        except (sqlite3.Error, CacheError, ValueError):
+            return None
+
+    def store_compatible_for(self, package: str, specs: List[str], result: Dict) -> None:
+        """Store the outcome of checking one direct requirement against its releases"""
+        if not package or not specs or not result:
+            return
+
+        requirement_key = _key('compatible_for', package, sorted(specs))
+        last_updated = int(time.time())
+        self._memo[requirement_key] = (last_updated, result)
+
+        self._enqueue_write(
+            '''INSERT INTO compatible_for
+               (requirement_key, result, last_updated)
+               VALUES (?, ?, ?)
+               ON CONFLICT(requirement_key) DO UPDATE SET
+                   result = excluded.result,
+                   last_updated = excluded.last_updated''',
+            [(requirement_key, msgpack.packb(result, use_bin_type=True), last_updated)]
+        )
 
     def store_resolutions(self, resolved_deps: Dict[str, str]) -> None:
         """Store resolved dependencies in SQLite cache"""
         if not resolved_deps:
             return
-            
-        last_updated = datetime.now().isoformat()
-        
-        try:
-            with sqlite3.connect(self.db_file) as conn:
-                cursor = conn.cursor()
-                for package, version in resolved_deps.items():
-                    if package and version:
-                        cursor.execute(
-                            '''INSERT OR REPLACE INTO resolutions 
-                               (package, version, last_updated) 
-                               VALUES (?, ?, ?)''',
-                            (package, version, last_updated)
-                        )
-                conn.commit()
-        except sqlite3.Error:
-            pass
+
+        last_updated = int(time.time())
+
+        self._enqueue_write(
+            '''INSERT INTO resolutions
+               (package, version, last_updated)
+               VALUES (?, ?, ?)
+               ON CONFLICT(package) DO UPDATE SET
+                   version = excluded.version,
+                   last_updated = excluded.last_updated''',
+            [(package, version, last_updated)
+             for package, version in resolved_deps.items() if package and version]
+        )
 
     def get_resolutions(self) -> Dict[str, str]:
         """Get cached dependency resolutions"""
+        self.flush()  # Not memoized, so make our own pending writes visible
         try:
-            with sqlite3.connect(self.db_file) as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    '''SELECT package, version, last_updated 
-                       FROM resolutions 
-                       WHERE last_updated > ?''',
-                    ((datetime.now() - self.cache_expiry).isoformat(),)
-                )
-                return {row[0]: row[1] for row in cursor.fetchall() if row[0] and row[1]}
-                
-        except sqlite3.Error:
+            cursor = self._reader().execute(
+                '''SELECT package, version, last_updated
+                   FROM resolutions
+                   WHERE last_updated > ?''',
+                (self._expiry_cutoff(),)
+            )
+            return {row[0]: row[1] for row in cursor.fetchall() if row[0] and row[1]}
+
+        except (sqlite3.Error, CacheError):
             return {}
+
+    def get_http_response(self, url: str) -> Optional[Tuple[Optional[str], Optional[str], bytes]]:
+        """Get the cached (etag, last_modified, body) of an HTTP response"""
+        if not url:
+            return None
+
+        try:
+            row = self._reader().execute(
+                '''SELECT etag, last_modified, body FROM http_responses
+                   WHERE url = ? AND status = 200 AND (etag IS NOT NULL OR last_modified IS NOT NULL)''',
+                (url,)
+            ).fetchone()
+            return (row[0], row[1], row[2]) if row else None
+
+        except (sqlite3.Error, CacheError):
+            return None
+
+    def get_fresh_http_response(self, url: str, max_age: int) -> Optional[Tuple[int, bytes]]:
+        """Get the (status, body) of a response stored less than max_age seconds ago"""
+        if not url or max_age <= 0:
+            return None
+
+        try:
+            row = self._reader().execute(
+                'SELECT status, body FROM http_responses WHERE url = ? AND last_updated > ?',
+                (url, int(time.time()) - max_age)
+            ).fetchone()
+            return (row[0], row[1]) if row else None
+
+        except (sqlite3.Error, CacheError):
+            return None
+
+    def store_http_response(self, url: str, etag: Optional[str], last_modified: Optional[str], body: bytes,
+                            status: int = 200) -> None:
+        """Store an HTTP response body with the validators needed to revalidate it"""
+        if not url or (status == 200 and not body):
+            return
+
+        self._enqueue_write(
+            '''INSERT INTO http_responses
+               (url, status, etag, last_modified, body, last_updated)
+               VALUES (?, ?, ?, ?, ?, ?)
+               ON CONFLICT(url) DO UPDATE SET
+                   status = excluded.status,
+                   etag = excluded.etag,
+                   last_modified = excluded.last_modified,
+                   body = excluded.body,
+                   last_updated = excluded.last_updated''',
+            [(url, status, etag, last_modified, body, int(time.time()))]
+        )
+
+    def get_requires(self, package: str, version: str) -> Optional[List[list]]:
+        """Get the cached parsed [name, specs, marker] requirements of a release"""
+        if not package or not version:
+            return None
+
+        release_key = _key('requires', package, version)
+        entry = self._memo.get(release_key)
+        if entry:
+            return entry[1]
+
+        try:
+            row = self._reader().execute(
+                'SELECT requires FROM requires WHERE release_key = ?',
+                (release_key,)
+            ).fetchone()
+
+            if row:
+                requires = msgpack.unpackb(row[0], raw=False)
+                self._memo[release_key] = (int(time.time()), requires)
+                return requires
+            return None
+
+        except (sqlite3.Error, CacheError, ValueError):
+            return None
+
+    def store_requires(self, package: str, version: str, requires: List[list]) -> None:
+        """Store the parsed [name, specs, marker] requirements of a release"""
+        if not package or not version or requires is None:
+            return
+
+        release_key = _key('requires', package, version)
+        last_updated = int(time.time())
+        self._memo[release_key] = (last_updated, requires)
+
+        self._enqueue_write(
+            '''INSERT INTO requires
+               (release_key, requires, last_updated)
+               VALUES (?, ?, ?)
+               ON CONFLICT(release_key) DO UPDATE SET
+                   requires = excluded.requires,
+                   last_updated = excluded.last_updated''',
+            [(release_key, msgpack.packb(requires, use_bin_type=True), last_updated)]
+        )
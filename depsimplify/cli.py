@@ -62,7 +62,6 @@ def resolve():
     try:
         parser = DependencyParser()
         resolver = DependencyResolver()
-        cache = DependencyCache()
         
         # Parse dependencies
         deps = parser.parse_project_dependencies()
@@ -72,6 +71,9 @@ def resolve():
             click.echo("✅ No conflicts to resolve!")
             return
             
+        # Fetch every conflicting package's versions at once rather than one per prompt
+        resolver.prefetch(conflicts)
+
         resolved_deps = {}
         for pkg, conflict in conflicts.items():
             click.echo(f"\n📦 Resolving conflict for {pkg}")
@@ -97,7 +99,7 @@ def resolve():
         # Update requirements.txt with resolved dependencies
         if resolved_deps:
             parser.update_requirements(resolved_deps)
-            cache.store_resolutions(resolved_deps)
+            resolver.cache.store_resolutions(resolved_deps)
             click.echo("\n✅ Successfully resolved conflicts!")
             
     except DependencyError as e:
@@ -1,25 +1,82 @@
-import re
 import ast
-from typing import Dict, List, Optional
-from packaging.requirements import Requirement
-from packaging.version import Version, parse
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+from packaging.requirements import InvalidRequirement, Requirement
+from packaging.version import InvalidVersion, Version, parse
 from .exceptions import DependencyError
+from .utils import canonical_name
 import os
+import shutil
+import tempfile
+
+# Maps every operator character to '<' so one find() locates the first of them
+_OPERATOR_MARK = str.maketrans('>=!~', '<<<<')
+_NAME_PUNCTUATION = str.maketrans('', '', '-_.')
+# Characters that can end a requirement's name: operators, extras, markers, URLs, spaces
+_NAME_END_MARK = str.maketrans('>=!~[;@( \t', '<<<<<<<<<<')
+# Every operator is decided by its first two characters, so a clause needs two set lookups
+_TWO_CHAR_OPERATORS = frozenset(('>=', '<=', '==', '!=', '~='))
+_ONE_CHAR_OPERATORS = frozenset(('>', '<'))
+
+def _scan_spec(line: str) -> Optional[Tuple[str, Tuple[str, ...]]]:
+    """Split a plain `name<op>version[,<op>version]` line with string operations
+
+    Returns None for anything else (extras, markers, URLs, wildcards, local
+    versions, ===), which is left to the full requirement grammar.
+    """
+    split = line.translate(_OPERATOR_MARK).find('<')
+    name, rest = (line, '') if split == -1 else (line[:split], line[split:])
+    name = name.strip()
+    if not name or not name.isascii() or not name.translate(_NAME_PUNCTUATION).isalnum() \
+            or not (name[0].isalnum() and name[-1].isalnum()):
+        return None
+
+    specs: List[str] = []
+    for piece in rest.split(',') if rest else ():
+        piece = piece.strip()
+        op = piece[:2]
+        if op not in _TWO_CHAR_OPERATORS:
+            op = piece[:1]
+            if op not in _ONE_CHAR_OPERATORS:
+                return None
+        elif piece.startswith('==='):
+            return None
+        version = piece[len(op):].strip()
+        if not version or '*' in version or '+' in version:
+            return None
+        try:
+            parsed = Version(version)
+        except InvalidVersion:
+            return None
+        if op == '~=' and len(parsed.release) < 2:
+            return None
+        specs.append(op + version)
+    return name, tuple(specs)
+
+@lru_cache(maxsize=1024)
+def _parse_spec(line: str) -> Optional[Tuple[str, Tuple[str, ...]]]:
+    """Parse a requirement string into (name, specifiers), or None if it is invalid"""
+    # Most lines are plain pins and bounds, which need no grammar at all
+    scanned = _scan_spec(line)
+    if scanned is not None:
+        return scanned
+    try:
+        req = Requirement(line)
+    except InvalidRequirement:
+        return None
+    return req.name, tuple(str(spec) for spec in req.specifier)
 
 class DependencyParser:
     """Parser for Python project dependencies"""
-    
-    def __init__(self):
-        self.requirement_pattern = re.compile(r'^([a-zA-Z0-9-_.]+)([<>=!~]+)([a-zA-Z0-9-_.]+)')
 
     def parse_project_dependencies(self) -> Dict[str, List[str]]:
         """Parse dependencies from requirements.txt and setup.py"""
-        deps = {}
+        deps: Dict[str, List[str]] = {}
         
         # Try requirements.txt first
         try:
             with open('requirements.txt', 'r') as f:
-                deps.update(self._parse_requirements(f.readlines()))
+                deps.update(self._parse_requirements(f))
         except FileNotFoundError:
             pass
             
@@ -35,66 +92,115 @@ class DependencyParser:
             
         return deps
 
-    def _parse_requirements(self, lines: List[str]) -> Dict[str, List[str]]:
-        """Parse requirements.txt format"""
-        deps = {}
+    def _parse_requirements(self, lines: Iterable[str]) -> Dict[str, List[str]]:
+        """Parse requirements.txt format, consuming lines lazily"""
+        deps: Dict[str, List[str]] = {}
         for line in lines:
             line = line.strip()
             if line and not line.startswith('#'):
-                try:
-                    req = Requirement(line)
-                    deps[req.name] = [str(spec) for spec in req.specifier]
-                except Exception:
-                    continue
+                parsed = _parse_spec(line)
+                if parsed:
+                    deps[canonical_name(parsed[0])] = list(parsed[1])
         return deps
 
     def _parse_setup_py(self, content: str) -> Dict[str, List[str]]:
         """Parse setup.py format"""
-        deps = {}
+        deps: Dict[str, List[str]] = {}
         try:
-            tree = ast.parse(content)
-            for node in ast.walk(tree):
-                if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == 'setup':
-                    for keyword in node.keywords:
-                        if keyword.arg == 'install_requires' and isinstance(keyword.value, ast.List):
-                            for elt in keyword.value.elts:
-                                if isinstance(elt, ast.Constant) and isinstance(elt.value, str):
-                                    try:
-                                        req = Requirement(elt.value)
-                                        deps[req.name] = [str(spec) for spec in req.specifier]
-                                    except Exception:
-                                        continue
+            node = self._find_setup_call(ast.parse(content))
+            if node is not None:
+                for keyword in node.keywords:
+                    if keyword.arg != 'install_requires':
+                        continue
+                    try:
+                        # Lists and tuples of string literals; anything computed is skipped
+                        requirements = ast.literal_eval(keyword.value)
+                    except (ValueError, TypeError, SyntaxError):
+                        continue
+                    if not isinstance(requirements, (list, tuple)):
+                        continue
+                    for requirement in requirements:
+                        if isinstance(requirement, str):
+                            parsed = _parse_spec(requirement)
+                            if parsed:
+                                deps[canonical_name(parsed[0])] = list(parsed[1])
         except Exception as e:
             pass
         return deps
 
+    def _find_setup_call(self, tree: ast.Module) -> Optional[ast.Call]:
+        """Find the setup() call among the top-level statements of setup.py"""
+        statements = list(tree.body)
+        for stmt in tree.body:
+            # setup() is sometimes guarded by `if __name__ == '__main__':`
+            if isinstance(stmt, ast.If):
+                statements.extend(stmt.body)
+
+        for stmt in statements:
+            node = stmt.value if isinstance(stmt, ast.Expr) else None
+            if not isinstance(node, ast.Call):
+                continue
+            # Both setup(...) and setuptools.setup(...)
+            func = node.func
+            if (isinstance(func, ast.Name) and func.id == 'setup') or \
+                    (isinstance(func, ast.Attribute) and func.attr == 'setup'):
+                return node
+        return None
+
+    def _rewrite_line(self, line: str, resolved_deps: Dict[str, str]) -> str:
+        """Pin a requirements.txt line to its resolved version, leaving other lines as they are
+
+        resolved_deps must be keyed by canonical name.
+        """
+        stripped = line.strip()
+        if not stripped or stripped.startswith('#'):
+            return line
+        # Lines for packages that were not resolved need no parsing at all
+        end = stripped.translate(_NAME_END_MARK).find('<')
+        if canonical_name(stripped if end == -1 else stripped[:end]) not in resolved_deps:
+            return line
+        parsed = _parse_spec(stripped)
+        if not parsed or canonical_name(parsed[0]) not in resolved_deps:
+            return line
+        # Keep the name as the file spells it
+        ending = '\n' if line.endswith('\n') else ''
+        return f"{parsed[0]}=={resolved_deps[canonical_name(parsed[0])]}{ending}"
+
     def update_requirements(self, resolved_deps: Dict[str, str], requirements_path: str = 'requirements.txt') -> None:
         """Update requirements.txt with resolved dependencies"""
+        tmp_path = None
         try:
             if not os.path.exists(requirements_path):
                 raise DependencyError(f"Requirements file not found: {requirements_path}")
-                
-            with open(requirements_path, 'r') as f:
-                lines = f.readlines()
-                
-            updated_lines = []
-            for line in lines:
-                line = line.strip()
-                if not line or line.startswith('#'):
-                    updated_lines.append(line)
-                    continue
-                    
-                try:
-                    req = Requirement(line)
-                    if req.name in resolved_deps:
-                        updated_lines.append(f"{req.name}=={resolved_deps[req.name]}")
-                    else:
-                        updated_lines.append(line)
-                except Exception:
-                    updated_lines.append(line)
-                    
-            with open(requirements_path, 'w') as f:
-                f.write('\n'.join(updated_lines) + '\n')
-                
+
+            if not resolved_deps:
+                return
+
+            resolved = {canonical_name(name): version for name, version in resolved_deps.items()}
+            with open(requirements_path, 'r') as src:
+                # Only the lines before the first change are held in memory
+                unchanged: List[str] = []
+                for line in src:
+                    rewritten = self._rewrite_line(line, resolved)
+                    if rewritten != line:
+                        break
+                    unchanged.append(line)
+                else:
+                    # Already pinned to the resolved versions, e.g. on a rerun: leave the file untouched
+                    return
+
+                # Stream the rest into a sibling temp file so the original is replaced atomically
+                with tempfile.NamedTemporaryFile(
+                        'w', dir=os.path.dirname(os.path.abspath(requirements_path)), delete=False) as dst:
+                    tmp_path = dst.name
+                    dst.writelines(unchanged)
+                    dst.write(rewritten)
+                    dst.writelines(self._rewrite_line(line, resolved) for line in src)
+
+            shutil.copymode(requirements_path, tmp_path)
+            os.replace(tmp_path, requirements_path)
+
         except Exception as e:
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
             raise DependencyError(f"Failed to update requirements.txt: {str(e)}")
@@ -1,10 +1,130 @@
-from typing import Dict, List, Set, Tuple, Optional
+import threading
+from bisect import bisect_left, bisect_right
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from itertools import islice
+from typing import Deque, Dict, Iterable, List, NamedTuple, Set, Tuple, Optional
 import requests
-from packaging.version import Version, parse
+from requests.adapters import HTTPAdapter
+from packaging.version import InvalidVersion, Version
 from packaging.specifiers import SpecifierSet
-from packaging.requirements import Requirement
+from packaging.markers import (
+    InvalidMarker, Marker, UndefinedComparison, UndefinedEnvironmentName, default_environment
+)
+from packaging.requirements import InvalidRequirement, Requirement
 from .exceptions import DependencyError
 from .cache import DependencyCache
+from .utils import canonical_name
+
+try:
+    from orjson import loads as _loads  # Optional speedup for large metadata documents
+except ImportError:
+    from json import loads as _loads
+
+try:
+    # Optional: multiplexes every request over one HTTP/2 connection to PyPI
+    import h2  # noqa: F401  (httpx needs it for http2=True)
+    import httpx
+except ImportError:
+    httpx = None
+
+_HTTP_ERRORS = (requests.RequestException,) + ((httpx.HTTPError,) if httpx else ())
+
+# Concurrent PyPI requests; each worker thread keeps its own keep-alive session
+MAX_WORKERS = 16
+
+# Requirements are checked against the running interpreter with no extras requested
+_ENVIRONMENT = dict(default_environment(), extra='')
+
+# Statuses meaning the index does not serve a document, rather than failing to right now
+_NOT_SERVED = {404: 'Not Found', 406: 'Not Acceptable'}
+
+# PEP 691 JSON form of the simple index, which lists versions without per-file metadata
+SIMPLE_JSON = "application/vnd.pypi.simple.v1+json"
+
+@lru_cache(maxsize=4096)
+def _make_specset(specs: Tuple[str, ...]) -> SpecifierSet:
+    """Parse a normalized tuple of specifiers, shared across all callers"""
+    return SpecifierSet(','.join(specs))
+
+@lru_cache(maxsize=65536)
+def _parse(version: str) -> Version:
+    """Parse a version string, shared across packages and resolver instances"""
+    return Version(version)
+
+@lru_cache(maxsize=4096)
+def _marker_applies(marker: str) -> bool:
+    """Evaluate an environment marker against the running interpreter"""
+    try:
+        return Marker(marker).evaluate(_ENVIRONMENT)
+    except (InvalidMarker, UndefinedComparison, UndefinedEnvironmentName):
+        return False
+
+def _series_end(release: Tuple[int, ...], epoch: int) -> Version:
+    """Smallest version after every release starting with the given segments"""
+    bumped = release[:-1] + (release[-1] + 1,)
+    return Version(f"{epoch}!{'.'.join(map(str, bumped))}.dev0")
+
+def _range_compatible(versions: List[Version], spec_set: SpecifierSet) -> Optional[Tuple[int, int]]:
+    """Narrow sorted versions to the (start, end) index window the specifiers allow
+
+    Every operator except === bounds a contiguous run of releases; != does not narrow
+    it. Returns None for ===. The window can still hold versions the specifiers
+    reject, such as pre-releases or excluded ones, so callers filter it with
+    SpecifierSet.contains.
+    """
+    lo, hi = 0, len(versions)
+    for spec in spec_set:
+        op, version = spec.operator, spec.version
+        if op == '===':
+            return None
+        if op == '!=':
+            continue
+        if version.endswith('.*'):
+            prefix = _parse(version[:-2])
+            if prefix.public != prefix.base_version:
+                continue  # A pre/post/dev prefix is rare; leave it to contains()
+            # ==1.4.* covers 1.4.dev0 up to, but excluding, 1.5.dev0
+            lo = max(lo, bisect_left(versions, _parse(f"{prefix}.dev0")))
+            hi = min(hi, bisect_left(versions, _series_end(prefix.release, prefix.epoch)))
+            continue
+
+        bound = _parse(version)
+        if op in ('>=', '==', '~='):
+            lo = max(lo, bisect_left(versions, bound))
+        elif op == '>':
+            lo = max(lo, bisect_right(versions, bound))
+        if op in ('<=', '=='):
+            end = bisect_right(versions, bound)
+            # Local versions sort after the release but still match <= and ==
+            while end < len(versions) and _parse(versions[end].public) == bound:
+                end += 1
+            hi = min(hi, end)
+        elif op == '<':
+            hi = min(hi, bisect_left(versions, bound))
+        elif op == '~=':
+            # ~=1.4.5 means >=1.4.5, ==1.4.*
+            hi = min(hi, bisect_left(versions, _series_end(bound.release[:-1], bound.epoch)))
+    return lo, max(lo, hi)
+
+def _latest(versions: List[Version]) -> Version:
+    """Pick the release PyPI reports as current: the newest final one if any"""
+    return max((v for v in versions if not v.is_prerelease), default=None) or max(versions)
+
+class _NotServed(DependencyError):
+    """PyPI answered definitively that it does not serve a document, e.g. 404 or HTML"""
+
+class _DirectCheck(NamedTuple):
+    """Outcome of checking a satisfiable direct requirement, reused by transitive checks"""
+    versions: List[Version]
+    ranks: List[int]  # Ascending positions in versions of the compatible ones
+
+    @classmethod
+    def of(cls, versions: List[Version], compatible: Set[Version], spec_set: SpecifierSet) -> '_DirectCheck':
+        """Rank the compatible versions; they all lie inside the requirement's window"""
+        start, end = _range_compatible(versions, spec_set) or (0, len(versions))
+        return cls(versions, [rank for rank in range(start, end) if versions[rank] in compatible])
 
 class DependencyResolver:
     """Resolves dependency conflicts and finds compatible versions"""
@@ -12,84 +132,277 @@ class DependencyResolver:
     def __init__(self):
         self.cache = DependencyCache()
         self.pypi_url = "https://pypi.org/pypi/{package}/json"
+        self.simple_url = "https://pypi.org/simple/{package}/"
+        self.release_url = "https://pypi.org/pypi/{package}/{version}/json"
+        # Stored responses younger than this are used without contacting PyPI, in seconds
+        self.metadata_ttl = 10 * 60
+        # Cleared once the index turns out not to serve the lightweight endpoints
+        self._simple_api = True
+        self._release_api = True
+        # httpx.Client is thread-safe and shares one connection among all workers;
+        # requests.Session is not, so without httpx every thread gets its own
+        self._client = httpx.Client(
+            http2=True, follow_redirects=True, limits=httpx.Limits(max_connections=MAX_WORKERS)
+        ) if httpx else None
+        self._sessions = threading.local()
+        self._executor = ThreadPoolExecutor(max_workers=MAX_WORKERS)
+        # One fetch per URL per run, shared by every caller that needs it
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+        self._versions: Dict[str, List[Version]] = {}
+        self._stable_versions: Dict[str, List[Version]] = {}
+
+    def _get_session(self) -> requests.Session:
+        """Get this thread's HTTP session, creating it on first use"""
+        session = getattr(self._sessions, 'session', None)
+        if session is None:
+            session = requests.Session()
+            # A thread issues one request at a time, so one pooled connection per host suffices
+            session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=1))
+            self._sessions.session = session
+        return session
+
+    def _http_get(self, url: str, headers: Dict[str, str]):
+        """GET a URL over the shared HTTP/2 client if available, else this thread's session"""
+        if self._client is not None:
+            return self._client.get(url, headers=headers)
+        return self._get_session().get(url, headers=headers)
 
     def _get_package_metadata(self, package: str) -> dict:
         """Get package metadata from PyPI"""
         if not package:
             raise DependencyError("Package name cannot be empty")
-            
+        return self._get_json(self.pypi_url.format(package=package), package)
+
+    def _get_json(self, url: str, package: str, accept: Optional[str] = None) -> dict:
+        """Get a JSON document, fetching it at most once per run"""
+        # The first caller fetches in its own thread and everyone else waits on its
+        # future, so a worker never blocks on a task still queued behind it
+        with self._inflight_lock:
+            future = self._inflight.get(url)
+            owner = future is None
+            if owner:
+                future = self._inflight[url] = Future()
+        if owner:
+            try:
+                future.set_result(self._fetch_json(url, package, accept))
+            except BaseException as e:
+                future.set_exception(e)
+                # Waiting callers still see the error, but a later call fetches afresh
+                with self._inflight_lock:
+                    del self._inflight[url]
+        return future.result()
+
+    def _fetch_json(self, url: str, package: str, accept: Optional[str] = None) -> dict:
+        """Fetch a JSON document about a package from PyPI"""
         try:
-            response = requests.get(self.pypi_url.format(package=package))
-            response.raise_for_status()
-            data = response.json()
-            if not data or not isinstance(data, dict):
-                raise DependencyError(f"No metadata found for package: {package}")
-            return data
-        except requests.RequestException as e:
+            # A recent response, including a 404 for an unknown package, needs no request
+            fresh = self.cache.get_fresh_http_response(url, self.metadata_ttl)
+            if fresh is not None:
+                status, body = fresh
+                if status == 404:
+                    raise _NotServed(f"Failed to fetch metadata for {package}: 404 {_NOT_SERVED[404]}")
+                return self._load_json(body, package)
+
+            # Revalidate a previously seen response instead of downloading it again
+            cached = self.cache.get_http_response(url)
+            headers = {'Accept': accept} if accept else {}
+            if cached:
+                etag, last_modified, _ = cached
+                if etag:
+                    headers['If-None-Match'] = etag
+                if last_modified:
+                    headers['If-Modified-Since'] = last_modified
+
+            response = self._http_get(url, headers)
+            if response.status_code == 304 and cached:
+                etag, last_modified, body = cached
+            else:
+                if response.status_code == 404:
+                    self.cache.store_http_response(url, None, None, b'', status=404)
+                if response.status_code in _NOT_SERVED:
+                    raise _NotServed(f"Failed to fetch metadata for {package}: "
+                                     f"{response.status_code} {_NOT_SERVED[response.status_code]}")
+                response.raise_for_status()
+                # An index without the JSON API answers with its HTML pages instead
+                content_type = response.headers.get('Content-Type')
+                if content_type and 'json' not in content_type:
+                    raise _NotServed(f"Failed to fetch metadata for {package}: got {content_type}")
+                etag, last_modified = response.headers.get('ETag'), response.headers.get('Last-Modified')
+                body = response.content
+            # Restart the TTL, also when revalidation found the stored body current
+            self.cache.store_http_response(url, etag, last_modified, body)
+
+            return self._load_json(body, package)
+        except _HTTP_ERRORS as e:
             raise DependencyError(f"Failed to fetch metadata for {package}: {str(e)}")
+
+    def _load_json(self, body: bytes, package: str) -> dict:
+        """Decode a PyPI JSON document"""
+        try:
+            data = _loads(body)
         except ValueError as e:
             raise DependencyError(f"Invalid metadata for {package}: {str(e)}")
-        
+        if not data or not isinstance(data, dict):
+            raise DependencyError(f"No metadata found for package: {package}")
+        return data
+
+    def _get_package_versions_simple(self, package: str) -> Optional[list]:
+        """Get a package's version strings from the PEP 691 simple index, if it serves them
+
+        Returns None if the index could not answer this time, and raises _NotServed if
+        it does not serve the versions at all.
+        """
+        if not self._simple_api:
+            return None
+        try:
+            versions = self._get_json(self.simple_url.format(package=package), package, SIMPLE_JSON).get('versions')
+        except _NotServed:
+            raise
+        except DependencyError:
+            return None
+        if not isinstance(versions, list):
+            # Simple JSON from before PEP 700 does not list versions
+            raise _NotServed(f"No versions listed for package: {package}")
+        return versions
+
+    def _get_package_versions(self, package: str) -> List[Version]:
+        """Get all released versions of a package, parsed once and sorted ascending"""
+        if package not in self._versions:
+            try:
+                releases, not_served = self._get_package_versions_simple(package), False
+            except _NotServed:
+                releases, not_served = None, True
+            if releases is None:
+                # Fall back to the full metadata, which raises for unknown packages
+                releases = self._get_package_metadata(package).get('releases', {})
+                # The package exists, so it is the index that does not serve the versions;
+                # a transient failure leaves the simple index in use for other packages
+                if not_served:
+                    self._simple_api = False
+                if not releases or not isinstance(releases, dict):
+                    raise DependencyError(f"No releases found for package: {package}")
+            versions = []
+            for release in releases:
+                try:
+                    versions.append(_parse(release))
+                except (InvalidVersion, TypeError):
+                    continue  # Legacy version strings can never match a specifier
+            versions.sort()  # Ascending, so bounded specifiers can bisect
+            self._stable_versions[package] = [v for v in versions if not v.is_prerelease]
+            self._versions[package] = versions
+        return self._versions[package]
+
+    def _get_requires_dist(self, package: str, version: Optional[str] = None) -> Tuple[Optional[str], list]:
+        """Get (version, requires_dist) of a release, from the per-release metadata when possible"""
+        info = None
+        not_served = False
+        if version and self._release_api:
+            try:
+                info = self._get_json(self.release_url.format(package=package, version=version), package).get('info')
+            except _NotServed:
+                not_served = True
+            except DependencyError:
+                pass
+        if info is None:
+            metadata = self._get_package_metadata(package)
+            info = metadata.get('info', {})
+            # Only stop asking when the index lacks a release it lists itself
+            releases = metadata.get('releases')
+            if not_served and isinstance(releases, dict) and version in releases:
+                self._release_api = False
+        if not info or not isinstance(info, dict):
+            return None, []
+        return info.get('version'), info.get('requires_dist') or []
+
     def _get_package_dependencies(self, package: str, version: Optional[str] = None) -> Dict[str, List[str]]:
         """Get package dependencies from PyPI"""
         if not package:
             return {}
             
         try:
-            pkg_data = self._get_package_metadata(package)
-            if not pkg_data or not isinstance(pkg_data, dict):
-                return {}
-            
-            # Get dependencies from info section
-            info = pkg_data.get('info', {})
-            if not info or not isinstance(info, dict):
-                return {}
-                
-            requires_dist = info.get('requires_dist', [])
-            if requires_dist is None:
-                requires_dist = []
-                
-            if not isinstance(requires_dist, list):
-                return {}
-                
-            dependencies = {}
-            
-            for req_str in requires_dist:
-                if not req_str or not isinstance(req_str, str):
-                    continue
-                try:
-                    # Skip environment markers and extras
-                    if ';' in req_str:
-                        req_str = req_str.split(';')[0].strip()
-                    if not req_str or 'extra ==' in req_str:
+            # A release's requirements never change, so each is parsed only once
+            requires = self.cache.get_requires(package, version) if version else None
+            if requires is None:
+                release, requires_dist = self._get_requires_dist(package, version)
+                if not isinstance(requires_dist, list):
+                    return {}
+
+                requires = []
+                for req_str in requires_dist:
+                    if not req_str or not isinstance(req_str, str):
+                        continue
+                    try:
+                        req = Requirement(req_str)
+                    except InvalidRequirement:
                         continue
-                        
-                    req = Requirement(req_str)
                     if req.specifier:
-                        dependencies[req.name] = [str(spec) for spec in req.specifier]
-                except Exception:
-                    continue
-                    
-            return dependencies
+                        requires.append([req.name, [str(spec) for spec in req.specifier],
+                                         str(req.marker) if req.marker else None])
+                self.cache.store_requires(package, release, requires)
+
+            # Drop requirements whose markers exclude this environment, extras included
+            return {canonical_name(name): specs for name, specs, marker in requires
+                    if marker is None or _marker_applies(marker)}
             
         except DependencyError:
             return {}
         except Exception:
             return {}
 
-    def _check_version_compatibility(self, versions: List[str], specs: List[str]) -> Set[str]:
-        """Check which versions are compatible with given specifications"""
+    def _fetch_all_versions(self, packages: Iterable[str]) -> Dict[str, Future]:
+        """Fetch the versions of several packages concurrently over the pooled sessions"""
+        return {package: self._executor.submit(self._get_package_versions, package)
+                for package in dict.fromkeys(packages)}
+
+    def prefetch(self, packages: Iterable[str]) -> None:
+        """Start fetching the versions of packages that will be looked up next"""
+        # Errors are left in the futures and surface when the package is looked up
+        self._fetch_all_versions(package for package in packages if package)
+
+    def _parse_specs(self, specs: List[str]) -> Optional[SpecifierSet]:
+        """Parse version specifications into a single SpecifierSet"""
+        if not specs or not isinstance(specs, list):
+            return None
+        try:
+            # Order and repeats do not change the set, so they do not split the cache
+            return _make_specset(tuple(sorted(set(specs))))
+        except Exception:
+            return None
+
+    def _candidate_versions(self, package: str, spec_set: SpecifierSet) -> Tuple[List[Version], Optional[bool]]:
+        """Get the sorted versions worth checking against spec_set and the prereleases flag to use"""
+        if not spec_set.prereleases:
+            # Pre-releases only match specifiers that name one, so leave them out up front
+            self._get_package_versions(package)
+            return self._stable_versions[package], False
+        return self._get_package_versions(package), None
+
+    def _compatible_versions(self, package: str, spec_set: Optional[SpecifierSet]) -> Set[Version]:
+        """Check which of a package's versions are compatible with given specifications"""
+        if spec_set is None:
+            return set()
+        versions, prereleases = self._candidate_versions(package, spec_set)
+        return self._check_version_compatibility(versions, spec_set, prereleases)
+
+    def _check_version_compatibility(self, versions: List[Version], spec_set: Optional[SpecifierSet],
+                                     prereleases: Optional[bool] = None) -> Set[Version]:
+        """Check which of the sorted versions are compatible with given specifications"""
         compatible = set()
-        if not versions or not specs or not isinstance(versions, list) or not isinstance(specs, list):
+        if not versions or spec_set is None or not isinstance(versions, list):
             return compatible
             
         try:
-            spec_set = SpecifierSet(','.join(specs))
+            # Plain bounds select a window of the sorted list; only it needs checking
+            window = _range_compatible(versions, spec_set)
+            if window is not None:
+                start, end = window
+                if start == end:
+                    return compatible
+                versions = versions[start:end]
             for version in versions:
-                if not version or not isinstance(version, str):
-                    continue
                 try:
-                    if spec_set.contains(version):
+                    if spec_set.contains(version, prereleases=prereleases):
                         compatible.add(version)
                 except Exception:
                     continue
@@ -105,125 +418,127 @@ class DependencyResolver:
         conflicts = {}
         
         # Check cache first
-        cached_conflicts = self.cache.get_conflicts(dependencies)
+        deps_key = self.cache._hash_deps(dependencies)
+        cached_conflicts = self.cache.get_conflicts(deps_key)
         if cached_conflicts:
             return cached_conflicts
 
         try:
-            # First pass: Get all direct and transitive dependencies
-            dep_graph = {}
+            # Requirements checked on an earlier run are answered from the cache, so only
+            # new or changed ones need their versions fetched
+            checked = {
+                pkg_name: self.cache.get_compatible_for(pkg_name, specs)
+                for pkg_name, specs in dependencies.items()
+                if pkg_name and specs and isinstance(specs, list)
+            }
+            versions = self._fetch_all_versions(pkg_name for pkg_name, hit in checked.items() if hit is None)
+
+            # Check each direct requirement, queueing the requirements fetch of every
+            # satisfiable package so all of them download while the rest are checked
+            analyzed: Dict[str, _DirectCheck] = {}
+            worklist: Deque[Tuple[str, Future]] = deque()
             for pkg_name, specs in dependencies.items():
                 if not pkg_name or not specs or not isinstance(specs, list):
                     continue
                     
                 try:
-                    # Get package metadata and check direct compatibility
-                    pkg_data = self._get_package_metadata(pkg_name)
-                    if not pkg_data or not isinstance(pkg_data, dict):
-                        conflicts[pkg_name] = {'error': 'Failed to fetch package data'}
-                        continue
-                        
-                    releases = pkg_data.get('releases', {})
-                    if not releases or not isinstance(releases, dict):
-                        conflicts[pkg_name] = {'error': 'No releases available'}
-                        continue
-                        
-                    all_versions = list(releases.keys())
-                    if not all_versions:
-                        conflicts[pkg_name] = {'error': 'No versions available'}
-                        continue
-                        
-                    compatible = self._check_version_compatibility(all_versions, specs)
+                    spec_set = self._parse_specs(specs)
+                    hit = checked[pkg_name]
+                    if hit is not None:
+                        # Only compatible versions can matter to later checks
+                        all_versions = [_parse(version) for version in hit['compatible']]
+                        compatible = set(all_versions)
+                        latest = hit['latest']
+                    else:
+                        # Get package versions and check direct compatibility
+                        all_versions = versions[pkg_name].result()
+                        if not all_versions:
+                            conflicts[pkg_name] = {'error': 'No versions available'}
+                            continue
+
+                        compatible = self._compatible_versions(pkg_name, spec_set)
+                        latest = str(_latest(all_versions))
+                        self.cache.store_compatible_for(pkg_name, specs, {
+                            'compatible': [str(version) for version in sorted(compatible)],
+                            'latest': latest,
+                        })
                     
                     if not compatible:
                         conflicts[pkg_name] = {'direct': specs}
                         continue
-                        
-                    # Get transitive dependencies
-                    trans_deps = self._get_package_dependencies(pkg_name)
-                    if trans_deps:  # Only add to graph if there are dependencies
-                        dep_graph[pkg_name] = {
-                            'specs': specs,
-                            'requires': trans_deps
-                        }
+                    analyzed[pkg_name] = _DirectCheck.of(all_versions, compatible, spec_set)
+                    worklist.append((pkg_name, self._executor.submit(
+                        self._get_package_dependencies, pkg_name, latest
+                    )))
                     
                 except DependencyError as e:
                     conflicts[pkg_name] = {'error': str(e)}
                 except Exception as e:
                     conflicts[pkg_name] = {'error': f'Unexpected error: {str(e)}'}
 
-            # Second pass: Check for conflicts between direct and transitive dependencies
-            if dep_graph:  # Only proceed if we have dependencies to check
-                for pkg_name, pkg_info in dep_graph.items():
-                    if not pkg_name or not isinstance(pkg_info, dict):
+            # Check transitive requirements against the direct ones as they arrive. Every
+            # direct package has been analyzed by now, and hub packages required with the
+            # same specs by many dependents are checked once per pair
+            overlaps: Dict[Tuple[str, SpecifierSet], bool] = {}
+            direct_names = {canonical_name(pkg_name): pkg_name for pkg_name in dependencies if pkg_name}
+            while worklist:
+                pkg_name, requires = worklist.popleft()
+                for dep_name, dep_specs in requires.result().items():
+                    # Only check conflicts with direct dependencies, however either side spells them
+                    dep_name = direct_names.get(dep_name)
+                    if not dep_specs or dep_name is None or not dependencies[dep_name]:
                         continue
-                        
-                    pkg_requires = pkg_info.get('requires', {})
-                    if not pkg_requires or not isinstance(pkg_requires, dict):
-                        continue
-                        
-                    for dep_name, dep_specs in pkg_requires.items():
-                        if not dep_name or not dep_specs or not isinstance(dep_specs, list):
+
+                    try:
+                        if dep_name not in analyzed:
+                            # Either the direct requirement was reported as unsatisfiable,
+                            # so just note who else needs it, or it was skipped as invalid
+                            if dep_name in conflicts and 'error' not in conflicts[dep_name]:
+                                conflicts[dep_name][pkg_name] = dep_specs
                             continue
-                            
-                        if dep_name in dependencies:  # Only check conflicts with direct dependencies
-                            try:
-                                # Check compatibility with direct requirement
-                                direct_specs = dependencies.get(dep_name)
-                                if not direct_specs or not isinstance(direct_specs, list):
-                                    continue
-
-                                # Get all versions of the dependency
-                                dep_data = self._get_package_metadata(dep_name)
-                                if not dep_data or not isinstance(dep_data, dict):
-                                    if dep_name not in conflicts:
-                                        conflicts[dep_name] = {}
-                                    conflicts[dep_name][pkg_name] = ['Failed to fetch package data']
-                                    continue
-                                    
-                                releases = dep_data.get('releases', {})
-                                if not releases or not isinstance(releases, dict):
-                                    if dep_name not in conflicts:
-                                        conflicts[dep_name] = {}
-                                    conflicts[dep_name][pkg_name] = ['No releases available']
-                                    continue
-                                    
-                                all_versions = list(releases.keys())
-                                if not all_versions:
-                                    if dep_name not in conflicts:
-                                        conflicts[dep_name] = {}
-                                    conflicts[dep_name][pkg_name] = ['No versions available']
-                                    continue
-                                
-                                # Check compatibility with direct requirement
-                                direct_compatible = self._check_version_compatibility(all_versions, direct_specs)
-                                
-                                # Check compatibility with transitive requirement
-                                trans_compatible = self._check_version_compatibility(all_versions, dep_specs)
-                                
-                                # If no overlap in compatible versions, we have a conflict
-                                if not direct_compatible or not trans_compatible or not direct_compatible.intersection(trans_compatible):
-                                    if dep_name not in conflicts:
-                                        conflicts[dep_name] = {}
-                                    conflicts[dep_name][pkg_name] = dep_specs
-                                    
-                            except DependencyError as e:
-                                if dep_name not in conflicts:
-                                    conflicts[dep_name] = {}
-                                conflicts[dep_name]['error'] = str(e)
-                            except Exception as e:
-                                if dep_name not in conflicts:
-                                    conflicts[dep_name] = {}
-                                conflicts[dep_name]['error'] = f'Unexpected error: {str(e)}'
+
+                        trans_spec_set = self._parse_specs(dep_specs)
+                        if trans_spec_set is None:
+                            overlap = False
+                        elif (dep_name, trans_spec_set) in overlaps:
+                            overlap = overlaps[dep_name, trans_spec_set]
+                        else:
+                            overlap = overlaps[dep_name, trans_spec_set] = self._overlaps(
+                                analyzed[dep_name], trans_spec_set
+                            )
+
+                        # If no overlap in compatible versions, we have a conflict
+                        if not overlap:
+                            conflicts.setdefault(dep_name, {})[pkg_name] = dep_specs
+
+                    except DependencyError as e:
+                        conflicts.setdefault(dep_name, {})['error'] = str(e)
+                    except Exception as e:
+                        conflicts.setdefault(dep_name, {})['error'] = f'Unexpected error: {str(e)}'
 
             # Cache results
             if conflicts:
-                self.cache.store_conflicts(dependencies, conflicts)
+                self.cache.store_conflicts(deps_key, conflicts)
             return conflicts
             
         except Exception as e:
             raise DependencyError(f"Error checking conflicts: {str(e)}")
 
+    def _overlaps(self, direct: _DirectCheck, spec_set: SpecifierSet) -> bool:
+        """Check whether any directly compatible version also satisfies spec_set"""
+        versions, ranks = direct
+        # A bounded requirement only needs the compatible versions inside its window,
+        # which are found by comparing integer ranks rather than Version objects
+        window = _range_compatible(versions, spec_set)
+        if window is not None:
+            first, last = bisect_left(ranks, window[0]), bisect_left(ranks, window[1])
+            # No compatible version in the window is a conflict without checking any
+            if first == last:
+                return False
+            ranks = ranks[first:last]
+        # Stop at the first shared version
+        return any(spec_set.contains(versions[rank]) for rank in ranks)
+
     def get_compatible_versions(self, package: str, conflict: Dict[str, List[str]]) -> List[str]:
         """Get list of versions compatible with all requirements"""
         if not package:
@@ -242,35 +557,39 @@ class DependencyResolver:
             if cached_versions:
                 return cached_versions
 
-            # Get all versions
-            pkg_data = self._get_package_metadata(package)  # This will raise DependencyError for invalid packages
-            if not pkg_data or not isinstance(pkg_data, dict):
-                raise DependencyError(f"Invalid metadata format for package: {package}")
-                
-            releases = pkg_data.get('releases', {})
-            if not releases or not isinstance(releases, dict):
-                raise DependencyError(f"No releases found for package: {package}")
-                
-            all_versions = list(releases.keys())
+            # Get all versions; this raises DependencyError for invalid packages
+            all_versions = self._get_package_versions(package)
             if not all_versions:
                 raise DependencyError(f"No versions available for package: {package}")
 
-            # Collect all specs
-            specs = []
+            # Collect the specs of each requirement in the conflict
+            spec_lists = []
             for spec_list in conflict.values():
                 if isinstance(spec_list, (list, set)):
-                    specs.extend(spec for spec in spec_list if spec)
+                    spec_list = [spec for spec in spec_list if spec]
+                    if spec_list:
+                        spec_lists.append(spec_list)
                     
-            if not specs:
+            if not spec_lists:
                 raise DependencyError("No valid version specifications found in conflict data")
 
-            # Find compatible versions
-            compatible = self._check_version_compatibility(all_versions, specs)
-            if not compatible:
+            # Every requirement must hold, so all of their specs form one merged set,
+            # parsed once and shared with later lookups of the same conflict
+            spec_set = self._parse_specs([spec for spec_list in spec_lists for spec in spec_list])
+            if spec_set is None:
                 return []
-            
-            # Sort and limit results
-            compatible_versions = sorted(list(compatible), key=parse, reverse=True)[:5]
+
+            # Find compatible versions
+            versions, prereleases = self._candidate_versions(package, spec_set)
+            window = _range_compatible(versions, spec_set)
+            if window is not None:
+                versions = versions[window[0]:window[1]]
+
+            # Only the newest five are reported, so check from the newest end and stop
+            # at the fifth match instead of testing every release
+            compatible_versions = [str(version) for version in islice(
+                (v for v in reversed(versions) if spec_set.contains(v, prereleases=prereleases)), 5
+            )]
 
             # Cache results
             if compatible_versions:
@@ -1,13 +1,21 @@
-from typing import List, Dict
-import pkg_resources
-from packaging.version import Version, parse
+import re
+from functools import lru_cache
+from typing import List, Dict, Optional, Tuple
+from importlib.metadata import PackageNotFoundError, version as _installed_version
+from packaging.utils import canonicalize_name
+from packaging.version import InvalidVersion, Version, parse
 from .exceptions import DependencyError
 
-def get_installed_version(package: str) -> str:
+@lru_cache(maxsize=4096)
+def canonical_name(name: str) -> str:
+    """Normalize a project name the way PyPI does, e.g. Charset_Normalizer -> charset-normalizer"""
+    return canonicalize_name(name)
+
+def get_installed_version(package: str) -> Optional[str]:
     """Get the installed version of a package"""
     try:
-        return pkg_resources.get_distribution(package).version
-    except pkg_resources.DistributionNotFound:
+        return _installed_version(package)
+    except PackageNotFoundError:
         return None
 
 def compare_versions(version1: str, version2: str) -> int:
@@ -35,22 +43,33 @@ def format_requirement(package: str, version: str) -> str:
     """Format package requirement string"""
     return f"{package}=={version}"
 
+# Longest operators first so '===' and '<=' are not read as '==' and '<'
+_SPEC_RE = re.compile(r'^\s*(===|==|!=|<=|>=|~=|<|>)\s*(\S+)\s*$')
+
+# Which bound each operator contributes to; other operators constrain neither
+_SPEC_BOUNDS = {'>=': 'min', '>': 'min', '<=': 'max', '<': 'max'}
+
 def parse_version_specs(specs: List[str]) -> Dict[str, List[Version]]:
     """Parse version specifications into min/max versions"""
-    result = {'min': [], 'max': []}
+    bounds = _parse_version_specs(tuple(specs))
+    return {bucket: list(versions) for bucket, versions in bounds.items()}
+
+@lru_cache(maxsize=1024)
+def _parse_version_specs(specs: Tuple[str, ...]) -> Dict[str, Tuple[Version, ...]]:
+    """Parse a tuple of version specifications, shared by repeated call sites"""
+    result: Dict[str, List[Version]] = {'min': [], 'max': []}
     
     for spec in specs:
+        match = _SPEC_RE.match(spec) if isinstance(spec, str) else None
+        if not match:
+            continue
+        op, version = match.groups()
+        bucket = _SPEC_BOUNDS.get(op)
+        if bucket is None:
+            continue
         try:
-            op = spec[:2] if spec[1] in ('=', '>') else spec[0]
-            version = spec[2:] if len(op) == 2 else spec[1:]
-            v = parse(version)
-            
-            if op in ('>=', '>'):
-                result['min'].append(v)
-            elif op in ('<=', '<'):
-                result['max'].append(v)
-                
-        except Exception:
+            result[bucket].append(parse(version))
+        except InvalidVersion:
             continue
             
-    return result
+    return {bucket: tuple(versions) for bucket, versions in result.items()}
@@ -1,14 +1,30 @@
+import os
+import platform
 from setuptools import setup, find_packages
 
+# Opt-in native build of the requirements parser: DEPSIMPLIFY_MYPYC=1 pip install .
+# The pure-Python module is used everywhere else, including on PyPy.
+ext_modules = []
+if os.environ.get("DEPSIMPLIFY_MYPYC") == "1" and platform.python_implementation() == "CPython":
+    from mypyc.build import mypycify
+    ext_modules = mypycify(["depsimplify/dependency_parser.py"])
+
 setup(
     name="depsimplify",
     version="0.1.0",
     packages=find_packages(),
+    ext_modules=ext_modules,
     install_requires=[
         "click>=8.0.0",
         "requests>=2.25.0",
         "packaging>=21.0",
+        "msgpack>=1.0",
     ],
+    extras_require={
+        # Faster JSON parsing, brotli-compressed responses and HTTP/2 to PyPI
+        "speedups": ["orjson>=3.0", "brotli>=1.0", "httpx[http2]>=0.23"],
+        "dev": ["pytest>=8.3.3", "pytest-xdist>=3.0"],
+    },
     entry_points={
         "console_scripts": [
             "depsimplify=depsimplify.cli:cli",
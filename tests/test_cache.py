@@ -0,0 +1,237 @@
+import os
+import sqlite3
+import threading
+import time
+import pytest
+from depsimplify.cache import DependencyCache
+from depsimplify.exceptions import CacheError
+
+def test_conflicts_roundtrip(tmp_path):
+    cache = DependencyCache(cache_dir=str(tmp_path / 'cache'))
+    cache.initialize()
+
+    deps = {'requests': ['>=2.25.0'], 'urllib3': ['<1.20.0']}
+    conflicts = {'urllib3': {'requests': ['<3', '>=1.21.1']}}
+
+    assert cache.get_conflicts(deps) is None
+    cache.store_conflicts(deps, conflicts)
+    assert cache.get_conflicts(deps) == conflicts
+
+    cache.close()
+
+def test_compatible_versions_roundtrip(tmp_path):
+    cache = DependencyCache(cache_dir=str(tmp_path / 'cache'))
+
+    conflict = {'requirements': ['>=1.26.0', '<2.0.0']}
+
+    # Cache is initialized lazily on first use
+    cache.store_compatible_versions('urllib3', conflict, ['1.26.20', '1.26.19'])
+    assert cache.get_compatible_versions('urllib3', conflict) == ['1.26.20', '1.26.19']
+    assert cache.get_compatible_versions('urllib3', {'requirements': ['<1.0']}) is None
+
+    cache.close()
+
+def test_resolutions_roundtrip(tmp_path):
+    cache = DependencyCache(cache_dir=str(tmp_path / 'cache'))
+    cache.initialize()
+
+    cache.store_resolutions({'requests': '2.26.0', 'urllib3': '1.26.0'})
+    assert cache.get_resolutions() == {'requests': '2.26.0', 'urllib3': '1.26.0'}
+
+    cache.close()
+
+def test_expired_entries_are_ignored(tmp_path):
+    cache = DependencyCache(cache_dir=str(tmp_path / 'cache'))
+    cache.initialize()
+
+    deps = {'requests': ['>=2.25.0']}
+    cache.store_conflicts(deps, {'requests': {'direct': ['>=2.25.0']}})
+
+    cache.cache_expiry = -1
+    assert cache.get_conflicts(deps) is None
+
+    cache.close()
+
+def test_lookups_are_memoized(tmp_path):
+    cache = DependencyCache(cache_dir=str(tmp_path / 'cache'))
+    deps = {'requests': ['>=2.25.0']}
+    conflicts = {'requests': {'direct': ['>=2.25.0']}}
+    cache.store_conflicts(deps, conflicts)
+    cache.close()
+
+    # Once read, an entry is served from memory even if the database goes away
+    other = DependencyCache(cache_dir=str(tmp_path / 'cache'))
+    assert other.get_conflicts(deps) == conflicts
+    other.close()
+    os.remove(other.db_file)
+    assert other.get_conflicts(deps) == conflicts
+
+    other.close()
+
+def test_conflicts_by_precomputed_digest(tmp_path):
+    cache = DependencyCache(cache_dir=str(tmp_path / 'cache'))
+
+    deps = {'urllib3': ['<1.20.0'], 'requests': ['>=2.25.0']}
+    conflicts = {'urllib3': {'requests': ['<3', '>=1.21.1']}}
+    cache.store_conflicts(DependencyCache._hash_deps(deps), conflicts)
+
+    # Key order does not matter and the dict form resolves to the same entry
+    reordered = {'requests': ['>=2.25.0'], 'urllib3': ['<1.20.0']}
+    assert cache.get_conflicts(reordered) == conflicts
+
+    # Neither does the order of a package's specifiers
+    deps = {'urllib3': ['>=1.0', '<1.20.0']}
+    cache.store_conflicts(deps, conflicts)
+    assert cache.get_conflicts({'urllib3': ['<1.20.0', '>=1.0']}) == conflicts
+
+    cache.close()
+
+def test_store_overwrites_existing_entry(tmp_path):
+    cache = DependencyCache(cache_dir=str(tmp_path / 'cache'))
+    cache.store_resolutions({'requests': '2.26.0'})
+    cache.store_resolutions({'requests': '2.31.0', 'urllib3': '1.26.0'})
+    assert cache.get_resolutions() == {'requests': '2.31.0', 'urllib3': '1.26.0'}
+    cache.close()
+
+def test_http_response_roundtrip(tmp_path):
+    cache = DependencyCache(cache_dir=str(tmp_path / 'cache'))
+    url = 'https://pypi.org/pypi/urllib3/json'
+
+    cache.store_http_response(url, '"abc"', None, b'{"info": {}}')
+    cache.flush()
+    assert cache.get_http_response(url) == ('"abc"', None, b'{"info": {}}')
+
+    # Without a validator there is no way to revalidate, so nothing is kept
+    cache.store_http_response('https://pypi.org/pypi/flask/json', None, None, b'{}')
+    cache.flush()
+    assert cache.get_http_response('https://pypi.org/pypi/flask/json') is None
+
+    cache.close()
+
+def test_requires_roundtrip(tmp_path):
+    cache = DependencyCache(cache_dir=str(tmp_path / 'cache'))
+    requires = [['urllib3', ['<3', '>=1.21.1'], None], ['PySocks', ['>=1.5.6'], 'extra == "socks"']]
+
+    assert cache.get_requires('requests', '2.31.0') is None
+    cache.store_requires('requests', '2.31.0', requires)
+    cache.close()
+
+    # Releases are immutable, so entries outlive the regular expiry
+    other = DependencyCache(cache_dir=str(tmp_path / 'cache'))
+    other.cache_expiry = -1
+    assert other.get_requires('requests', '2.31.0') == requires
+    assert other.get_requires('requests', '2.32.0') is None
+
+    other.close()
+
+def test_fresh_http_responses(tmp_path):
+    cache = DependencyCache(cache_dir=str(tmp_path / 'cache'))
+    missing = 'https://pypi.org/pypi/this-package-does-not-exist/json'
+
+    cache.store_http_response('https://pypi.org/pypi/flask/json', None, None, b'{}')
+    cache.store_http_response(missing, None, None, b'', status=404)
+    cache.flush()
+
+    # Responses without validators, and unknown packages, are still served within their TTL
+    assert cache.get_fresh_http_response('https://pypi.org/pypi/flask/json', 600) == (200, b'{}')
+    assert cache.get_fresh_http_response(missing, 600) == (404, b'')
+    assert cache.get_fresh_http_response(missing, 0) is None
+    assert cache.get_http_response(missing) is None
+
+    cache.close()
+
+def test_tables_do_not_share_keys(tmp_path):
+    cache = DependencyCache(cache_dir=str(tmp_path / 'cache'))
+
+    cache.store_compatible_for('requests', ['>=2.25.0'], {'compatible': ['2.31.0'], 'latest': '2.31.0'})
+    assert cache.get_conflicts({'requests': ['>=2.25.0']}) is None
+    assert cache.get_compatible_for('requests', ['>=2.25.0']) == {'compatible': ['2.31.0'], 'latest': '2.31.0'}
+
+    cache.close()
+
+def test_failed_initialize_does_not_block_writes(tmp_path, monkeypatch):
+    cache = DependencyCache(cache_dir=str(tmp_path / 'cache'))
+
+    def unavailable(*args, **kwargs):
+        raise sqlite3.OperationalError('unable to open database file')
+
+    # The writer thread hits the failure first and must not wait on its own queue
+    monkeypatch.setattr(sqlite3, 'connect', unavailable)
+    cache.store_resolutions({'requests': '2.26.0'})
+    cache.flush()
+    assert cache.get_conflicts({'requests': ['>=2.25.0']}) is None
+
+    cache.store_resolutions({'requests': '2.31.0'})
+    cache.close()
+
+def test_close_stops_writer_thread(tmp_path):
+    before = threading.active_count()
+    for _ in range(5):
+        cache = DependencyCache(cache_dir=str(tmp_path / 'cache'))
+        cache.store_resolutions({'requests': '2.26.0'})
+        cache.close()
+    assert threading.active_count() == before
+
+    # A closed cache can still be written to
+    cache.store_resolutions({'requests': '2.31.0'})
+    cache.close()
+    assert DependencyCache(cache_dir=str(tmp_path / 'cache')).get_resolutions() == {'requests': '2.31.0'}
+
+def test_unusable_cache_dir_is_a_miss(tmp_path):
+    blocker = tmp_path / 'file'
+    blocker.write_text('')
+    cache = DependencyCache(cache_dir=str(blocker / 'cache'))
+
+    # The directory cannot be created, so every lookup misses instead of raising
+    cache.store_resolutions({'requests': '2.26.0'})
+    cache.flush()
+    assert cache.get_conflicts({'requests': ['>=2.25.0']}) is None
+    assert cache.get_resolutions() == {}
+    with pytest.raises(CacheError):
+        cache.initialize()
+
+    cache.close()
+
+def test_corrupted_database_is_removed_with_wal_files(tmp_path):
+    cache_dir = tmp_path / 'cache'
+    cache_dir.mkdir()
+    for suffix in ('', '-wal', '-shm'):
+        (cache_dir / f'cache.db{suffix}').write_bytes(b'not a database' * 100)
+
+    cache = DependencyCache(cache_dir=str(cache_dir))
+    with pytest.raises(CacheError):
+        cache.initialize()
+    assert list(cache_dir.iterdir()) == []
+
+    # The next use starts from a clean database
+    cache.store_resolutions({'requests': '2.26.0'})
+    cache.flush()
+    assert cache.get_resolutions() == {'requests': '2.26.0'}
+    cache.close()
+
+def test_concurrent_first_use_opens_one_writer(tmp_path, monkeypatch):
+    cache = DependencyCache(cache_dir=str(tmp_path / 'cache'))
+    writers = []
+    connect = sqlite3.connect
+
+    def counting_connect(database, *args, **kwargs):
+        if not kwargs.get('uri'):
+            writers.append(database)
+            time.sleep(0.05)  # Give every thread the chance to race for the writer
+        return connect(database, *args, **kwargs)
+
+    monkeypatch.setattr(sqlite3, 'connect', counting_connect)
+    barrier = threading.Barrier(16)
+
+    def lookup():
+        barrier.wait()
+        cache.get_fresh_http_response('https://pypi.org/pypi/requests/json', 600)
+
+    threads = [threading.Thread(target=lookup) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(writers) == 1
+    cache.close()
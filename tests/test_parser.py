@@ -1,3 +1,4 @@
+import os
 import pytest
 from depsimplify.dependency_parser import DependencyParser
 from depsimplify.exceptions import DependencyError
@@ -23,6 +24,17 @@ def test_parse_requirements(tmp_path):
     assert '<2.0.0' in deps['urllib3']
     assert '==2.0.0' in deps['flask']
 
+def test_parse_requirements_from_open_file(tmp_path):
+    parser = DependencyParser()
+
+    req_file = tmp_path / "requirements.txt"
+    req_file.write_text("requests>=2.25.0\n# Comment line\nflask==2.0.0\n")
+
+    with open(req_file) as f:
+        deps = parser._parse_requirements(f)
+
+    assert deps == {'requests': ['>=2.25.0'], 'flask': ['==2.0.0']}
+
 def test_parse_setup_py(tmp_path):
     parser = DependencyParser()
     
@@ -71,3 +83,72 @@ def test_update_requirements(tmp_path):
     assert 'requests==2.26.0' in updated_content
     assert 'urllib3==1.26.0' in updated_content
     assert 'flask==2.0.0' in updated_content
+
+def test_update_requirements_preserves_other_lines(tmp_path):
+    parser = DependencyParser()
+
+    req_file = tmp_path / "requirements.txt"
+    original = "# Pinned by hand  \n\n    flask==2.0.0\nrequests>=2.25.0"
+    req_file.write_text(original)
+
+    parser.update_requirements({'requests': '2.26.0'}, requirements_path=str(req_file))
+
+    assert req_file.read_text() == "# Pinned by hand  \n\n    flask==2.0.0\nrequests==2.26.0"
+    assert [p.name for p in tmp_path.iterdir()] == ["requirements.txt"]
+
+def test_update_requirements_skips_unchanged_file(tmp_path):
+    parser = DependencyParser()
+
+    req_file = tmp_path / "requirements.txt"
+    req_file.write_text("requests==2.26.0\nflask==2.0.0\n")
+    os.utime(req_file, (0, 0))
+
+    parser.update_requirements({'requests': '2.26.0'}, requirements_path=str(req_file))
+    parser.update_requirements({}, requirements_path=str(req_file))
+
+    assert req_file.stat().st_mtime == 0
+    assert req_file.read_text() == "requests==2.26.0\nflask==2.0.0\n"
+
+def test_parse_requirements_mixed_lines():
+    parser = DependencyParser()
+
+    deps = parser._parse_requirements([
+        'urllib3 >= 1.21.1, <3',
+        'requests[socks]>=2.25.0',
+        'six==1.*',
+        'pywin32>=300; sys_platform == "win32"',
+        '-e .',
+    ])
+
+    assert sorted(deps['urllib3']) == ['<3', '>=1.21.1']
+    assert deps['requests'] == ['>=2.25.0']
+    assert deps['six'] == ['==1.*']
+    assert deps['pywin32'] == ['>=300']
+    assert len(deps) == 4
+
+def test_parse_setup_py_tuple_requirements():
+    parser = DependencyParser()
+
+    deps = parser._parse_setup_py("""
+import setuptools
+
+if __name__ == '__main__':
+    setuptools.setup(
+        name='test-project',
+        install_requires=('requests>=2.25.0', 'click'),
+    )
+""")
+
+    assert deps == {'requests': ['>=2.25.0'], 'click': []}
+
+def test_names_are_canonicalized(tmp_path):
+    parser = DependencyParser()
+
+    deps = parser._parse_requirements(['Flask==2.0.0', 'charset_normalizer>=3'])
+    assert deps == {'flask': ['==2.0.0'], 'charset-normalizer': ['>=3']}
+
+    # Lines are matched however they are spelled, and keep their spelling
+    req_file = tmp_path / "requirements.txt"
+    req_file.write_text("Flask==2.0.0\ncharset_normalizer>=3\n")
+    parser.update_requirements({'flask': '2.3.0', 'Charset-Normalizer': '3.3.2'}, str(req_file))
+    assert req_file.read_text() == "Flask==2.3.0\ncharset_normalizer==3.3.2\n"
@@ -1,9 +1,14 @@
 import pytest
-from depsimplify.resolver import DependencyResolver
+import requests
+from depsimplify.resolver import DependencyResolver, _DirectCheck, _NotServed
+from depsimplify.cache import DependencyCache
 from depsimplify.exceptions import DependencyError
+from packaging.specifiers import SpecifierSet
+from packaging.version import Version
 
-def test_find_conflicts():
+def test_find_conflicts(tmp_path):
     resolver = DependencyResolver()
+    resolver.cache = DependencyCache(cache_dir=str(tmp_path / 'cache'))
     
     # Test with compatible dependencies
     deps = {
@@ -23,8 +28,9 @@ def test_find_conflicts():
     conflicts = resolver.find_conflicts(deps)
     assert 'urllib3' in conflicts
 
-def test_get_compatible_versions():
+def test_get_compatible_versions(tmp_path):
     resolver = DependencyResolver()
+    resolver.cache = DependencyCache(cache_dir=str(tmp_path / 'cache'))
     
     conflict = {
         'requirements': {'>=1.26.0', '<2.0.0'}
@@ -34,8 +40,158 @@ def test_get_compatible_versions():
     assert versions
     assert all('1.' in v for v in versions)
 
-def test_invalid_package():
+def test_invalid_package(tmp_path):
     resolver = DependencyResolver()
+    resolver.cache = DependencyCache(cache_dir=str(tmp_path / 'cache'))
     
     with pytest.raises(DependencyError):
         resolver.get_compatible_versions('this-package-does-not-exist', {})
+
+def test_bounded_specifiers_match_full_scan():
+    resolver = DependencyResolver()
+    versions = sorted(Version(v) for v in ['0.9', '1.0a1', '1.0', '1.0.post1', '1.2rc1', '1.2', '2.0', '3.0'])
+
+    for specs in (['>=1.0', '<2.0'], ['==1.2'], ['>1.0', '<=2.0'], ['<0.9'], ['~=1.0', '!=1.2'], ['==1.*'], ['===2.0']):
+        spec_set = SpecifierSet(','.join(specs))
+        expected = {version for version in versions if spec_set.contains(version)}
+        assert resolver._check_version_compatibility(versions, spec_set) == expected
+
+def test_overlaps_match_full_scan():
+    resolver = DependencyResolver()
+    versions = sorted(Version(v) for v in ['0.9', '1.0a1', '1.0', '1.0.post1', '1.2rc1', '1.2', '2.0', '3.0'])
+
+    for direct_specs in (['>=1.0', '<2.0'], ['!=1.2'], ['===2.0']):
+        direct_set = SpecifierSet(','.join(direct_specs))
+        compatible = resolver._check_version_compatibility(versions, direct_set)
+        direct = _DirectCheck.of(versions, compatible, direct_set)
+        for specs in (['>=2.0'], ['<1.0'], ['==1.2'], ['~=1.0', '!=1.2'], ['==3.*'], ['===2.0']):
+            spec_set = SpecifierSet(','.join(specs))
+            expected = any(spec_set.contains(version) for version in compatible)
+            assert resolver._overlaps(direct, spec_set) == expected, (direct_specs, specs)
+
+def test_compatible_versions_merge_requirements(tmp_path, monkeypatch):
+    resolver = DependencyResolver()
+    resolver.cache = DependencyCache(cache_dir=str(tmp_path / 'cache'))
+    monkeypatch.setattr(resolver, '_get_package_versions_simple',
+                        lambda package: ['1.25.0', '1.26.0', '1.26.18', '2.0.0'])
+
+    conflict = {'requests': ['<3', '>=1.26'], 'botocore': ['<2.1', '>=1.26'], 'direct': ['!=1.26.18']}
+    assert resolver.get_compatible_versions('urllib3', conflict) == ['2.0.0', '1.26.0']
+    assert resolver._parse_specs(['>=1.26', '<3', '>=1.26']) is resolver._parse_specs(['<3', '>=1.26'])
+    assert resolver.get_compatible_versions('urllib3', {'direct': ['not a specifier']}) == []
+    resolver.cache.close()
+
+def test_non_list_specs_are_skipped(tmp_path, monkeypatch):
+    resolver = DependencyResolver()
+    resolver.cache = DependencyCache(cache_dir=str(tmp_path / 'cache'))
+    monkeypatch.setattr(resolver, '_get_package_versions_simple', lambda package: ['2.30.0', '2.31.0'])
+    monkeypatch.setattr(resolver, '_get_requires_dist',
+                        lambda package, version=None: (version, ['urllib3<3,>=1.26']))
+
+    # Nothing to check, so nothing is fetched
+    assert resolver.find_conflicts({'a': None, '': ['>=1.0'], 'b': '>=1.0'}) == {}
+
+    # A skipped direct requirement is not mistaken for an unsatisfiable one
+    assert resolver.find_conflicts({'requests': ['>=2.25.0'], 'urllib3': '>=1.26'}) == {}
+    resolver.cache.close()
+
+def test_failed_fetch_is_retried(monkeypatch):
+    resolver = DependencyResolver()
+    calls = []
+
+    def fetch_json(url, package, accept=None):
+        calls.append(url)
+        if len(calls) == 1:
+            raise DependencyError(f"Failed to fetch metadata for {package}")
+        return {'info': {}, 'releases': {'1.0': []}}
+
+    monkeypatch.setattr(resolver, '_fetch_json', fetch_json)
+    with pytest.raises(DependencyError):
+        resolver._get_package_metadata('requests')
+
+    # Successful responses are shared; failures are not kept
+    assert resolver._get_package_metadata('requests') == resolver._get_package_metadata('requests')
+    assert len(calls) == 2
+
+def test_lightweight_endpoints_survive_transient_errors(monkeypatch):
+    resolver = DependencyResolver()
+    failures = {}
+    full = {'info': {'version': '2.0', 'requires_dist': []}, 'releases': {'1.0': [], '2.0': []}}
+
+    def fetch_json(url, package, accept=None):
+        if url in failures:
+            raise failures[url]
+        return full
+
+    monkeypatch.setattr(resolver, '_fetch_json', fetch_json)
+
+    # A timeout or server error says nothing about what the index serves
+    failures[resolver.simple_url.format(package='flaky')] = DependencyError("Failed to fetch metadata for flaky")
+    failures[resolver.release_url.format(package='flaky', version='2.0')] = DependencyError("timed out")
+    resolver._get_package_versions('flaky')
+    resolver._get_requires_dist('flaky', '2.0')
+    assert resolver._simple_api and resolver._release_api
+
+    # A 404 for a package and release that do exist does
+    failures[resolver.simple_url.format(package='demo')] = _NotServed("Failed to fetch metadata for demo")
+    failures[resolver.release_url.format(package='demo', version='2.0')] = _NotServed("404 Not Found")
+    assert resolver._get_package_versions('demo') == [Version('1.0'), Version('2.0')]
+    assert resolver._get_requires_dist('demo', '2.0') == ('2.0', [])
+    assert not resolver._simple_api and not resolver._release_api
+
+def test_prereleases_only_match_when_named(monkeypatch):
+    resolver = DependencyResolver()
+    monkeypatch.setattr(resolver, '_get_package_versions_simple', lambda package: ['1.0', '2.0b1', '2.0'])
+
+    assert resolver._compatible_versions('demo', SpecifierSet('>=1.0')) == {Version('1.0'), Version('2.0')}
+    assert Version('2.0b1') in resolver._compatible_versions('demo', SpecifierSet('>=2.0b1'))
+
+def test_unchanged_requirements_are_not_refetched(tmp_path, monkeypatch):
+    fetched = []
+    releases = {'requests': ['2.30.0', '2.31.0'], 'urllib3': ['1.25.0', '1.26.0', '2.0.0'], 'idna': ['3.4']}
+    requires = {'requests': ['urllib3<3,>=1.26', 'idna<4,>=2.5'], 'urllib3': [], 'idna': []}
+
+    def make_resolver():
+        resolver = DependencyResolver()
+        resolver.cache = DependencyCache(cache_dir=str(tmp_path / 'cache'))
+        monkeypatch.setattr(resolver, '_get_package_versions_simple',
+                            lambda package: fetched.append(package) or releases[package])
+        monkeypatch.setattr(resolver, '_get_requires_dist',
+                            lambda package, version=None: (version, requires[package]))
+        return resolver
+
+    first = make_resolver()
+    assert first.find_conflicts({'requests': ['>=2.30'], 'urllib3': ['<2']}) == {}
+    first.cache.close()
+
+    # Adding a requirement only fetches the new package; the rest come from the cache
+    fetched.clear()
+    second = make_resolver()
+    deps = {'requests': ['>=2.30'], 'urllib3': ['<1.26'], 'idna': ['>=3']}
+    assert second.find_conflicts(deps) == {'urllib3': {'requests': ['<3', '>=1.26']}}
+    assert sorted(fetched) == ['idna', 'urllib3']
+    second.cache.close()
+
+def test_unknown_package_is_not_refetched(tmp_path, monkeypatch):
+    requested = []
+
+    def not_found(self, url, headers):
+        requested.append(url)
+        response = requests.Response()
+        response.status_code = 404
+        response.url = url
+        return response
+
+    monkeypatch.setattr(DependencyResolver, '_http_get', not_found)
+    for _ in range(2):
+        resolver = DependencyResolver()
+        resolver.cache = DependencyCache(cache_dir=str(tmp_path / 'cache'))
+        with pytest.raises(DependencyError):
+            resolver.get_compatible_versions('this-package-does-not-exist', {'requirements': ['>=1.0']})
+        resolver.cache.close()
+
+    # The second resolver answers from the cached 404s without any request
+    assert requested == [
+        'https://pypi.org/simple/this-package-does-not-exist/',
+        'https://pypi.org/pypi/this-package-does-not-exist/json',
+    ]